@@ -1,95 +1,164 @@
 import os
-import csv
 import argparse
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 
-def tum_norm_tsv(directory: str, extension: str, output_tsv_file: str):
+# Path markers for the condition directories: requiring separators on both
+# sides keeps the match exact-component, and a substring find over the whole
+# lowercased path is one C-level scan instead of a per-part comparison loop.
+_TUMOR_MARK = os.sep + "tumor" + os.sep
+_NORMAL_MARK = os.sep + "normal" + os.sep
+
+_HEADER = ("patient", "sample", "condition", "path")
+
+# Directory basenames never worth descending into for sample discovery.
+_SKIP_DIRS = frozenset({'.git', '__pycache__', 'logs', 'tmp'})
+
+def _iter_files(top: str, ext: str, skip_dirs: frozenset = _SKIP_DIRS, max_depth=None,
+                include_dirs=None):
+    """Yield paths of files under top whose name ends with ext.
+
+    Stack-based os.scandir traversal: the dir/file classification reuses the
+    d_type info from the directory read, avoiding an extra stat() per entry,
+    and the extension test runs on the bare entry name so non-matching files
+    (usually the vast majority) never trigger a path join.
+    Subtrees whose basename is in skip_dirs (or starts with a dot), or for
+    which the optional include_dirs(name) predicate returns False, are pruned
+    before they are ever scanned, and max_depth bounds how many directory
+    levels below top are descended.
+    """
+    scandir = os.scandir  # local binding skips a module-attribute lookup per dir
+    stack = [(top, 0)]
+    while stack:
+        path, depth = stack.pop()
+        with scandir(path) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name in skip_dirs or entry.name.startswith('.'):
+                        continue
+                    if include_dirs is not None and not include_dirs(entry.name):
+                        continue
+                    if max_depth is None or depth + 1 <= max_depth:
+                        stack.append((entry.path, depth + 1))
+                elif entry.name.endswith(ext):
+                    yield entry.path
+
+def tum_norm_tsv(directory: str, extension: str, output_tsv_file: str,
+                 skip_dirs: frozenset = _SKIP_DIRS, max_depth=None,
+                 include_dirs=None, threads: int = 1):
     if not extension.startswith('.'):
         extension = '.' + extension
 
-    header = ["patient", "sample", "condition", "path"]
-    rows = []
-
-    for root, _, files in os.walk(directory):
-        for file_item in files: # Renamed 'file' to 'file_item' to avoid clash with 'file' type
-            if file_item.endswith(extension):
-                full_path = os.path.abspath(os.path.join(root, file_item))
-                path_parts = full_path.split(os.sep)
-
-                patient = "Unknown"
-                sample = "Unknown"
-                condition_val = "Unknown"
-                
-                condition_index = -1
-                for i, part in enumerate(path_parts):
-                    part_lower = part.lower()
-                    if part_lower == "tumor":
-                        condition_val = "Tumor"
-                        condition_index = i
-                        break 
-                    elif part_lower == "normal":
-                        condition_val = "Normal"
-                        condition_index = i
-                        break
-                
-                if condition_index != -1: # "tumor" or "normal" was found
-                    # Patient extraction
-                    if condition_index - 1 >= 0:
-                        patient = path_parts[condition_index - 1]
-                    # else: patient remains "Unknown"
-
-                    # Sample extraction
-                    # Check if there is a part after the condition_part
-                    if condition_index + 1 < len(path_parts):
-                        potential_sample_part_idx = condition_index + 1
-                        # This is the part directly after "normal"/"tumor"
-                        
-                        # Check if this potential_sample_part is a directory.
-                        # It's a directory if it's not the last part of the path (which is the filename).
-                        filename_idx = len(path_parts) - 1
-                        if potential_sample_part_idx < filename_idx:
-                            sample = path_parts[potential_sample_part_idx]
-                        else:
-                            # The part after "normal"/"tumor" is the filename itself.
-                            # So, there's no intermediate sample directory. Sample remains "Unknown".
-                            pass # sample is already "Unknown"
-                    # else: Path ends with "normal"/"tumor" or has no parts after it. Sample remains "Unknown".
-                
-                else: # "tumor" or "normal" NOT found, condition_val remains "Unknown"
-                    # Fallback logic using path relative to the initial search directory
-                    # os.path.normpath is used on 'directory' to handle potential trailing slashes an ensure clean relpath
-                    relative_path = os.path.relpath(full_path, os.path.normpath(directory))
-                    relative_path_parts = relative_path.split(os.sep)
-
-                    # Expected structures relative to search directory:
-                    # 1. patient_dir/file.ext (e.g., patient4_nodirs/patient4_file.bed)
-                    #    Here, patient = patient_dir, sample = Unknown
-                    # 2. patient_dir/sample_dir/file.ext (No intermediate dir like "other_condition")
-                    #    Here, patient = patient_dir, sample = sample_dir
-                    # 3. patient_dir/intermediate_dir/sample_dir/file.ext (e.g., patient3 path)
-                    #    Here, patient = patient_dir, sample = sample_dir
-
-                    if len(relative_path_parts) >= 2: # Minimum: patient_dir/file.ext
-                        patient = relative_path_parts[0]
-                        
-                        if len(relative_path_parts) == 2: # Case 1: patient_dir/file.ext
-                            sample = "Unknown"
-                        elif len(relative_path_parts) >= 3: # Case 2 or 3: patient_dir/.../sample_dir/file.ext
-                            # Sample is the directory containing the file, which is the second to last part.
-                            sample = relative_path_parts[-2]
-                        # else: sample remains "Unknown" if structure is odd (e.g. only 1 part, though >=2 handles this)
-                    # else: path is too shallow (e.g. file directly in search_dir), patient/sample remain "Unknown"
-
-                rows.append({
-                    "patient": patient,
-                    "sample": sample,
-                    "condition": condition_val,
-                    "path": full_path
-                })
-
-    with open(output_tsv_file, 'w', newline='') as tsvfile:
-        writer = csv.DictWriter(tsvfile, fieldnames=header, delimiter='\t')
-        writer.writeheader()
-        writer.writerows(rows)
+    # Hoisted invariants: the walker is started from an absolute root so every
+    # yielded path is already absolute and per-file abspath() calls disappear.
+    sep = os.sep
+    norm_dir = os.path.normpath(os.path.abspath(directory))
+    dir_prefix = norm_dir + sep
+    dir_prefix_len = len(dir_prefix)
+
+    # With threads > 1 each top-level (typically per-patient) subtree is
+    # walked by its own pool worker — scandir releases the GIL around the
+    # directory-read syscalls, so the walks overlap on NFS-like storage —
+    # while the TSV rows are still written serially below.
+    if threads > 1:
+        sub_dirs = []
+        root_files = []
+        with os.scandir(norm_dir) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name in skip_dirs or entry.name.startswith('.'):
+                        continue
+                    if include_dirs is not None and not include_dirs(entry.name):
+                        continue
+                    if max_depth is None or max_depth >= 1:
+                        sub_dirs.append(entry.path)
+                elif entry.name.endswith(extension):
+                    root_files.append(entry.path)
+
+        # A top-level dir sits at depth 1, so its subtree gets one level less
+        child_depth = None if max_depth is None else max_depth - 1
+        file_lists = [root_files]
+        if sub_dirs:
+            def scan(top):
+                return list(_iter_files(top, extension, skip_dirs, child_depth,
+                                        include_dirs))
+
+            with ThreadPoolExecutor(max_workers=min(threads, len(sub_dirs))) as executor:
+                file_lists.extend(executor.map(scan, sub_dirs))
+        walked = chain.from_iterable(file_lists)
+    else:
+        walked = _iter_files(norm_dir, extension, skip_dirs, max_depth,
+                             include_dirs)
+
+    # Fixed 4-column schema: a formatted line per row through a 1 MiB buffer
+    # beats csv.writer's per-row/per-field Python dispatch, and the kernel
+    # sees a handful of large writes instead of one per row.
+    with open(output_tsv_file, 'w', buffering=1 << 20, newline='') as tsvfile:
+        tsvfile.write('\t'.join(_HEADER) + '\n')
+
+        for full_path in walked:
+            patient = "Unknown"
+            sample = "Unknown"
+            condition_val = "Unknown"
+
+            # Only a few components are ever read, so locate them with rfind
+            # indices instead of allocating a list per file via split().
+            i1 = full_path.rfind(sep)          # separator before the filename
+            i2 = full_path.rfind(sep, 0, i1)   # before the containing dir
+
+            # One lower() pass, then two substring scans; earliest hit wins.
+            lowered = full_path.lower()
+            t = lowered.find(_TUMOR_MARK)
+            n = lowered.find(_NORMAL_MARK)
+            if t != -1 and (n == -1 or t < n):
+                mark_pos, condition_val = t, "Tumor"
+            elif n != -1:
+                mark_pos, condition_val = n, "Normal"
+            else:
+                mark_pos = -1
+
+            if mark_pos != -1: # "tumor" or "normal" was found
+                # Component index of the condition dir: separators before it,
+                # plus one for the component itself.
+                condition_index = lowered.count(sep, 0, mark_pos) + 1
+                # The condition branch needs arbitrary components, so split
+                # the original-case path only here.
+                path_parts = full_path.split(sep)
+
+                # Patient extraction
+                if condition_index - 1 >= 0:
+                    patient = path_parts[condition_index - 1]
+                # else: patient remains "Unknown"
+
+                # Sample extraction: the part directly after "normal"/"tumor",
+                # but only if it is a directory (i.e. not the filename itself).
+                if condition_index + 1 < len(path_parts) - 1:
+                    sample = path_parts[condition_index + 1]
+                # else: sample remains "Unknown"
+
+            else: # "tumor" or "normal" NOT found, condition_val remains "Unknown"
+                # Fallback logic using path relative to the initial search
+                # directory. Walked paths are rooted under norm_dir, so a
+                # prefix strip replaces the much costlier os.path.relpath;
+                # relpath stays as a safety net for anything else.
+                if full_path.startswith(dir_prefix):
+                    relative_path = full_path[dir_prefix_len:]
+                else:
+                    relative_path = os.path.relpath(full_path, norm_dir)
+                depth = relative_path.count(sep) + 1
+
+                # Expected structures relative to search directory:
+                # 1. patient_dir/file.ext            -> patient, sample Unknown
+                # 2. patient_dir/sample_dir/file.ext -> patient, sample
+                # 3. patient_dir/.../sample_dir/file.ext -> patient, sample
+                if depth >= 2: # Minimum: patient_dir/file.ext
+                    patient = relative_path[:relative_path.find(sep)]
+
+                    if depth >= 3: # the directory containing the file
+                        sample = full_path[i2 + 1:i1]
+                # else: path is too shallow (file directly in search_dir), patient/sample remain "Unknown"
+
+            tsvfile.write(f"{patient}\t{sample}\t{condition_val}\t{full_path}\n")
 
     print(f"Sample sheet created: {output_tsv_file}")
 
@@ -98,5 +167,13 @@ if __name__ == "__main__":
     parser.add_argument("directory", type=str, help="Directory to search for files.")
     parser.add_argument("extension", type=str, help="File extension to search for (e.g., 'bed', '.txt').")
     parser.add_argument("output_file", type=str, help="Path to the output TSV file.")
+    parser.add_argument("--skip-dirs", type=str, nargs='*', default=sorted(_SKIP_DIRS),
+                        help="Directory basenames to prune from the search.")
+    parser.add_argument("--max-depth", type=int, default=None,
+                        help="Maximum directory depth below the search directory.")
+    parser.add_argument("--threads", type=int, default=1,
+                        help="Walker threads (one per top-level subtree; useful on network filesystems).")
     args = parser.parse_args()
-    tum_norm_tsv(args.directory, args.extension, args.output_file)
+    tum_norm_tsv(args.directory, args.extension, args.output_file,
+                 skip_dirs=frozenset(args.skip_dirs), max_depth=args.max_depth,
+                 threads=args.threads)
@@ -24,17 +24,19 @@ def example_basic_usage():
     data_directory = "/path/to/your/nanopore/data"
     
     try:
-        # Generate samples YAML file
-        yaml_file = generate_samples_yaml(
+        # Generate samples YAML file, keeping the in-memory dict so
+        # validation doesn't need to re-parse the file from disk
+        yaml_file, samples = generate_samples_yaml(
             directory=data_directory,
             file_extension=".fast5",
-            output_filename="my_samples"
+            output_filename="my_samples",
+            return_data=True
         )
-        
+
         print(f"Generated YAML file: {yaml_file}")
-        
-        # Validate the generated file
-        if validate_samples_yaml(yaml_file):
+
+        # Validate the generated data
+        if validate_samples_yaml(samples):
             print("✓ YAML file is valid")
         else:
             print("✗ YAML file validation failed")
@@ -1,4 +1,14 @@
-from setuptools import setup, find_packages
+from setuptools import Extension, setup, find_packages
+
+# The C walker extension is optional: build it when Cython is available,
+# otherwise pureMeth.utils falls back to the pure-Python scandir walker.
+try:
+    from Cython.Build import cythonize
+    ext_modules = cythonize(
+        [Extension("pureMeth._walk", ["src/pureMeth/_walk.pyx"])]
+    )
+except ImportError:
+    ext_modules = []
 
 setup(
     name="pureMeth",
@@ -11,7 +21,10 @@ setup(
     url="https://github.com/sahuno/pureMeth",
     packages=find_packages(where="src"),
     package_dir={"": "src"},
+    ext_modules=ext_modules,
     install_requires=[
+        # Install PyYAML built against libyaml to get the CSafeDumper/CSafeLoader
+        # fast paths used by pureMeth.utils.
         "pyyaml>=6.0",
     ],
     extras_require={
@@ -8,18 +8,22 @@ __email__ = "ahunos@mskcc.org"
 
 from .utils import (
     generate_samples_yaml,
+    generate_samples_yaml_from_tsv,
     generate_tumor_normal_yaml,
     create_patient_bams_from_directory,
     validate_tumor_normal_yaml,
     generate_samples_tsv,
-    create_patient_samples_from_directory
+    create_patient_samples_from_directory,
+    clear_discovery_cache
 )
 
 __all__ = [
     "generate_samples_yaml",
+    "generate_samples_yaml_from_tsv",
     "generate_tumor_normal_yaml", 
     "create_patient_bams_from_directory",
     "validate_tumor_normal_yaml",
     "generate_samples_tsv",
-    "create_patient_samples_from_directory"
+    "create_patient_samples_from_directory",
+    "clear_discovery_cache"
 ]
\ No newline at end of file
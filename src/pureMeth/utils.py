@@ -4,30 +4,403 @@ Utility functions for pureMeth package
 
 import os
 import csv
+import io
+import functools
+import json
+import re
+import threading
 import yaml
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional, Union
-from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from operator import attrgetter
+
+# Prefer the libyaml C bindings when PyYAML was built with them; the
+# pure-Python emitter/parser is an order of magnitude slower.
+try:
+    from yaml import CSafeDumper as SafeDumper, CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeDumper, SafeLoader
+
+# Compiled readdir-based walker (built when Cython is available at install
+# time); None means the pure-Python scandir walker below is used.
+try:
+    from ._walk import iter_files as _iter_files_c
+except ImportError:
+    _iter_files_c = None
+
+# orjson (C, SIMD-accelerated) parses JSON-form sample sheets a further
+# 2-5x faster than stdlib json; entirely optional.
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+
+def _iter_files(top: Union[str, Path], ext: Union[str, tuple], threads: int = 1,
+                max_depth: Optional[int] = None):
+    """
+    Recursively yield paths of files under top whose name ends with ext
+    (a single extension, or a tuple of extensions matched in one endswith)
+
+    Uses an explicit stack with os.scandir so directory/file classification
+    reuses the d_type info from the directory read instead of issuing an
+    extra stat() per entry; the extension test runs on the bare entry name,
+    so non-matching files never cost a path construction. With threads > 1 the walk is fanned out over a
+    small thread pool, which overlaps readdir latency on network filesystems
+    (NFS/Lustre) where a serial walk leaves the link idle.
+
+    Args:
+        top (str or Path): Directory to walk
+        ext (str): File extension to match (including leading dot)
+        threads (int): Number of walker threads (1 keeps the serial walk)
+        max_depth (int, optional): Maximum directory levels below top to
+            descend; None walks the whole tree. Bounding the depth for
+            fixed-layout trees (e.g. patient/sample/file) skips unrelated
+            deep subtrees entirely.
+
+    Yields:
+        str: Full path of each matching file
+    """
+    scandir = os.scandir  # local binding skips a module-attribute lookup per dir
+    if max_depth is not None:
+        stack = [(str(top), 0)]
+        while stack:
+            path, depth = stack.pop()
+            with scandir(path) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if depth + 1 <= max_depth:
+                            stack.append((entry.path, depth + 1))
+                    elif entry.name.endswith(ext):
+                        yield entry.path
+        return
+
+    if threads > 1:
+        yield from _iter_files_parallel(str(top), ext, threads)
+        return
+
+    # The compiled walker matches a single bytes suffix; tuple-of-extension
+    # matches stay on the pure-Python walker, where str.endswith accepts
+    # the tuple directly.
+    if _iter_files_c is not None and isinstance(ext, str):
+        yield from _iter_files_c(str(top), ext)
+        return
+
+    stack = [str(top)]
+    while stack:
+        path = stack.pop()
+        with scandir(path) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(ext):
+                    yield entry.path
+
+
+def _iter_files_bytes(top: bytes, ext: bytes, max_depth: Optional[int] = None):
+    """
+    Serial walker over fsencoded paths, yielding bytes paths
+
+    Passing bytes to os.scandir keeps entry names as raw bytes, skipping the
+    per-dirent UTF-8 decode that str walks pay; callers that match filenames
+    against pre-encoded patterns can defer decoding to the few paths that
+    actually match.
+    """
+    scandir = os.scandir  # local binding skips a module-attribute lookup per dir
+    stack = [(top, 0)]
+    while stack:
+        path, depth = stack.pop()
+        with scandir(path) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if max_depth is None or depth + 1 <= max_depth:
+                        stack.append((entry.path, depth + 1))
+                elif entry.name.endswith(ext):
+                    yield entry.path
+
+
+def _iter_files_parallel(top: str, ext: str, threads: int):
+    """
+    Threaded variant of _iter_files: workers pull directories off a shared
+    LIFO stack, scandir them (the GIL is released around the syscall), push
+    subdirectories back and hand matched files to the consuming thread.
+
+    Per-directory entries are sorted by name so results are reproducible for
+    a given tree, though ordering across directories depends on scheduling.
+    """
+    lock = threading.Lock()
+    on_input = threading.Condition(lock)
+    on_output = threading.Condition(lock)
+    state = {'tasks': 1}
+    paths = [top]
+    output: List[str] = []
+
+    def worker():
+        while True:
+            with lock:
+                while not paths:
+                    if state['tasks'] == 0:
+                        return
+                    on_input.wait()
+                path = paths.pop()
+            dirs = []
+            files = []
+            try:
+                with os.scandir(path) as it:
+                    for entry in sorted(it, key=attrgetter('name')):
+                        if entry.is_dir(follow_symlinks=False):
+                            dirs.append(entry.path)
+                        elif entry.name.endswith(ext):
+                            files.append(entry.path)
+            except OSError:
+                pass  # unreadable directory: account for it and move on
+            with lock:
+                state['tasks'] += len(dirs) - 1
+                paths.extend(dirs)
+                output.extend(files)
+                if state['tasks'] == 0:
+                    on_input.notify_all()
+                elif dirs:
+                    on_input.notify(len(dirs))
+                on_output.notify()
+
+    workers = [threading.Thread(target=worker, daemon=True) for _ in range(threads)]
+    for w in workers:
+        w.start()
+
+    while True:
+        with lock:
+            while not output and state['tasks'] > 0:
+                on_output.wait()
+            if not output and state['tasks'] == 0:
+                break
+            batch, output[:] = output[:], []
+        yield from batch
+
+    for w in workers:
+        w.join()
+
+
+# PyYAML's implicit resolver decides what a plain (unquoted) scalar parses
+# back as; bound once so the per-scalar call is a first-character dict lookup
+# plus at most a few anchored regex matches.
+_resolve_plain = yaml.resolver.Resolver().resolve
+_STR_TAG = 'tag:yaml.org,2002:str'
+
+
+def _yaml_scalar(value: str) -> str:
+    """Quote a scalar for block YAML only when it actually needs it
+
+    Beyond syntactically unsafe characters, any value the YAML resolver
+    would load back as a non-string (int/float/bool/null/timestamp
+    spellings such as '0001', 'true' or '1e5') is quoted, so the fast
+    writer round-trips every string exactly like the baseline dumper.
+    """
+    if (not value
+            or any(c in value for c in ':#\n\t"\\')
+            or value.startswith(('!', '&', '*', '?', '|', '>', '%', '@', '`',
+                                 '-', ' ', "'", '[', ']', '{', '}', ','))
+            or value.endswith(' ')
+            or _resolve_plain(yaml.ScalarNode, value, (True, False)) != _STR_TAG):
+        return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+    return value
+
+
+def _fast_yaml_lines(obj: Dict, chunks: List[str], indent: int = 0) -> None:
+    """Append the block-YAML lines for a nested dict-of-strings to chunks"""
+    pad = '  ' * indent
+    for key, value in obj.items():
+        if isinstance(value, dict):
+            if value:
+                chunks.append(f"{pad}{_yaml_scalar(str(key))}:\n")
+                _fast_yaml_lines(value, chunks, indent + 1)
+            else:
+                chunks.append(f"{pad}{_yaml_scalar(str(key))}: {{}}\n")
+        else:
+            chunks.append(f"{pad}{_yaml_scalar(str(key))}: {_yaml_scalar(str(value))}\n")
+
+
+def _fast_yaml_dump(obj: Dict, out) -> None:
+    """
+    Write a nested dict-of-strings mapping as a block-style YAML document
+
+    The general-purpose PyYAML emitter walks a representer graph and applies
+    scalar-style heuristics per node; the sample-sheet schemas this package
+    emits are plain nested string mappings, so a direct write is equivalent
+    and far cheaper. Keys keep their insertion order and scalars are quoted
+    only when they contain YAML-significant characters. The document is
+    joined in memory and handed to the stream as one write, so together with
+    the buffered open it reaches the kernel in a single syscall.
+    """
+    chunks: List[str] = []
+    _fast_yaml_lines(obj, chunks)
+    out.write(''.join(chunks))
+
+
+def _load_yaml_or_json(f):
+    """
+    Parse an open sample-sheet file, dispatching on the first character
+
+    A document starting with '{' or '[' (after leading whitespace) is almost
+    always JSON, which json.load parses an order of magnitude faster than
+    PyYAML. But the same prefix is legal flow-style YAML, so a failed JSON
+    parse falls back to the C SafeLoader instead of erroring out; everything
+    else goes straight to the SafeLoader.
+    """
+    ch = f.read(1)
+    while ch and ch.isspace():
+        ch = f.read(1)
+    f.seek(0)
+    if ch and ch in '{[':
+        try:
+            if _orjson is not None:
+                return _orjson.loads(f.read())
+            return json.load(f)
+        except ValueError:  # JSONDecodeError (json and orjson) subclasses this
+            f.seek(0)
+    return yaml.load(f, Loader=SafeLoader)
+
+
+@functools.lru_cache(maxsize=256)
+def _load_yaml_cached(path: str, mtime: float):
+    """
+    Parse a YAML (or JSON-form) file, memoized on (path, mtime)
+
+    Workflow scripts tend to validate the same sample sheet several times per
+    pipeline run; keying the cache on the file's mtime makes repeat loads a
+    dict lookup while still auto-invalidating whenever the file changes.
+    """
+    with open(path, 'r') as f:
+        return _load_yaml_or_json(f)
+
+
+def _open_buffered(path: str, newline: Optional[str] = None):
+    """
+    Open path for writing through a 1 MiB buffer
+
+    The default text-mode buffer is ~8 KiB, so multi-MB sample sheets go to
+    the kernel in hundreds of small write() calls; a 1 MiB binary buffer
+    under a TextIOWrapper coalesces them, which matters most on network
+    filesystems where each write is a round-trip.
+    """
+    return io.TextIOWrapper(open(path, 'wb', buffering=1 << 20),
+                            encoding='utf-8', newline=newline)
+
+
+def _default_output_path(prefix: str, ext: str) -> str:
+    """
+    Timestamped default output path in the current working directory
+
+    Formats the datetime via f-string __format__ (strftime in C, no method
+    lookup) and joins plain strings, skipping the Path.cwd() PurePath
+    allocation the writers previously paid per call.
+    """
+    return os.path.join(os.getcwd(), f"{prefix}_{datetime.now():%Y%m%d_%H%M%S}{ext}")
+
+
+@functools.lru_cache(maxsize=32)
+def _norm_ext(ext: str) -> str:
+    """Normalize an extension to its leading-dot form, cached per spelling"""
+    return ext if ext.startswith('.') else f'.{ext}'
+
+
+@functools.lru_cache(maxsize=64)
+def _compile(pattern: str, flags: int = 0):
+    """Compile and cache a regex so repeated calls don't re-parse the pattern"""
+    return re.compile(pattern, flags)
+
+
+def _condition_matcher(condition_patterns: Dict[str, List[str]]):
+    """
+    Build a single-regex classifier for condition patterns
+
+    All patterns are folded into one alternation with a named group per
+    condition, so classifying a path component is a single C-level scan
+    instead of nested Python loops over conditions and patterns. The
+    leftmost occurrence in the component wins; ties at the same position
+    fall to the condition declared first. Conditions with an empty pattern
+    list are skipped (an empty alternation would match everything), and if
+    nothing is left the classifier is a constant None.
+    """
+    group_names = {}
+    alternatives = []
+    for index, (condition, patterns) in enumerate(condition_patterns.items()):
+        if not patterns:
+            continue
+        group = f"c{index}"  # group names must be identifiers; conditions may not be
+        group_names[group] = condition
+        alternatives.append("(?P<%s>%s)" % (group, "|".join(map(re.escape, patterns))))
+
+    if not alternatives:
+        return lambda part: None
+    pattern = re.compile("|".join(alternatives), re.IGNORECASE)
+
+    def match(part: str) -> Optional[str]:
+        m = pattern.search(part)
+        return group_names[m.lastgroup] if m else None
+
+    return match
+
+
+def _missing_paths(paths: List[str]) -> List[str]:
+    """
+    Return the subset of paths that do not exist on disk
+
+    Paths are grouped by parent directory and each distinct parent is read
+    once with os.scandir, turning N per-file stat() calls into D directory
+    reads (D = number of distinct parents) — for the usual flat per-patient
+    layouts that is an order of magnitude fewer syscalls. Directory reads
+    are fanned out over a thread pool since the GIL is released around the
+    getdents syscall. Like lexists, a broken symlink counts as present.
+    """
+    by_dir: Dict[str, List[str]] = {}
+    for path in paths:
+        by_dir.setdefault(os.path.dirname(path), []).append(path)
+
+    def check_dir(item):
+        parent, children = item
+        try:
+            with os.scandir(parent or '.') as it:
+                names = {entry.name for entry in it}
+        except OSError:
+            return children  # parent missing/unreadable: all children missing
+        return [p for p in children if os.path.basename(p) not in names]
+
+    missing: List[str] = []
+    if by_dir:
+        with ThreadPoolExecutor(max_workers=min(32, len(by_dir))) as executor:
+            for chunk in executor.map(check_dir, by_dir.items()):
+                missing.extend(chunk)
+    return missing
 
 
 def generate_samples_yaml(
-    directory: str, 
-    file_extension: str, 
-    output_filename: Optional[str] = None
-) -> str:
+    directory: str,
+    file_extension: str,
+    output_filename: Optional[str] = None,
+    fast: bool = True,
+    return_data: bool = False
+) -> Union[str, tuple]:
     """
     Recursively search directory and generate samples_[date_time].yaml file
-    
+
     Args:
         directory (str): Path to directory to search
         file_extension (str): File extension to search for (e.g., '.fast5', '.pod5')
         output_filename (str, optional): Custom output filename (without extension)
                                        If None, uses format 'samples_[datetime]'
-    
+        fast (bool): Emit the YAML with the schema-specialized writer (default);
+                     set False to go through the general PyYAML dumper
+        return_data (bool): Also return the in-memory samples dict, so callers
+                            can validate or inspect it without re-parsing the file
+
     Returns:
         str: Path to generated YAML file
-        
+             (with return_data=True: tuple of (path, samples dict))
+
     Raises:
         FileNotFoundError: If directory doesn't exist
         ValueError: If no files with specified extension found
@@ -41,94 +414,185 @@ def generate_samples_yaml(
         raise ValueError(f"Path is not a directory: {directory}")
     
     # Ensure file extension starts with dot
-    if not file_extension.startswith('.'):
-        file_extension = '.' + file_extension
-    
-    # Find all files with specified extension recursively
-    sample_files = []
-    for file_path in directory_path.rglob(f'*{file_extension}'):
-        if file_path.is_file():
-            sample_files.append(file_path)
+    file_extension = _norm_ext(file_extension)
     
+    # Find all files with specified extension recursively; the scandir
+    # generator already classified entries, so no per-path is_file() stat.
+    # Walking from an absolute root means every yielded path is already
+    # absolute, so no per-file absolute()/getcwd() round-trips are needed.
+    # Sorting raw strings uses C-level comparison rather than Path.__lt__.
+    sample_files = sorted(_iter_files(directory_path.absolute(), file_extension))
+
     if not sample_files:
         raise ValueError(f"No files with extension '{file_extension}' found in {directory}")
-    
+
     # Create samples dictionary
     samples_dict = {"samples": {}}
+
+    for file_path in sample_files:
+        # Use filename without extension as sample name, absolute path as
+        # location; splitext/basename avoid a Path allocation per file
+        sample_name = os.path.splitext(os.path.basename(file_path))[0]
+        samples_dict["samples"][sample_name] = file_path
     
-    for file_path in sorted(sample_files):
-        # Use filename without extension as sample name
-        sample_name = file_path.stem
-        # Use absolute path for sample location
-        samples_dict["samples"][sample_name] = str(file_path.absolute())
-    
-    # Generate output filename with timestamp if not provided
+    # Write YAML file to current working directory, timestamped by default
     if output_filename is None:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_filename = f"samples_{timestamp}"
-    
-    # Ensure .yaml extension
-    if not output_filename.endswith('.yaml') and not output_filename.endswith('.yml'):
-        output_filename += '.yaml'
-    
-    # Write YAML file to current working directory
-    output_path = Path.cwd() / output_filename
-    
-    with open(output_path, 'w') as yaml_file:
-        yaml.dump(samples_dict, yaml_file, default_flow_style=False, indent=2)
+        output_path = _default_output_path("samples", ".yaml")
+    else:
+        # Ensure .yaml extension
+        if not output_filename.endswith(('.yaml', '.yml')):
+            output_filename += '.yaml'
+        output_path = os.path.join(os.getcwd(), output_filename)
+
+    with _open_buffered(output_path) as yaml_file:
+        if fast:
+            _fast_yaml_dump(samples_dict, yaml_file)
+        else:
+            yaml.dump(samples_dict, yaml_file, Dumper=SafeDumper, default_flow_style=False, indent=2)
     
     print(f"Generated YAML file: {output_path}")
     print(f"Found {len(sample_files)} samples with extension '{file_extension}'")
-    
-    return str(output_path)
 
+    if return_data:
+        return output_path, samples_dict
+    return output_path
 
-def list_sample_files(directory: str, file_extension: str) -> List[Path]:
+
+def generate_samples_yaml_from_tsv(
+    tsv_file: str,
+    output_filename: Optional[str] = None,
+    fast: bool = True
+) -> str:
     """
-    List all files with specified extension in directory (recursive)
-    
+    Convert a two-column (sample, path) TSV into a samples YAML file
+
+    Rows are read with csv.reader (the row split happens in C); blank rows
+    are skipped and extra columns beyond the first two are ignored.
+
+    Args:
+        tsv_file (str): Path to the input TSV (sample name, file path)
+        output_filename (str, optional): Custom output filename (without extension)
+                                       If None, uses format 'samples_[datetime]'
+        fast (bool): Emit the YAML with the schema-specialized writer (default);
+                     set False to go through the general PyYAML dumper
+
+    Returns:
+        str: Path to generated YAML file
+
+    Raises:
+        FileNotFoundError: If the TSV file doesn't exist
+        ValueError: If the TSV contains no rows or a row has fewer than
+                    two columns
+    """
+    samples: Dict[str, str] = {}
+    with open(tsv_file, 'r', newline='') as f:
+        for line_no, row in enumerate(csv.reader(f, delimiter='\t'), start=1):
+            if not row:
+                continue
+            if len(row) < 2:
+                raise ValueError(
+                    f"Malformed row at line {line_no} of {tsv_file}: "
+                    f"expected 2 tab-separated columns (sample, path), got {len(row)}"
+                )
+            samples[row[0]] = row[1]
+
+    if not samples:
+        raise ValueError(f"No sample rows found in {tsv_file}")
+
+    samples_dict = {"samples": samples}
+
+    # Write YAML file to current working directory, timestamped by default
+    if output_filename is None:
+        output_path = _default_output_path("samples", ".yaml")
+    else:
+        # Ensure .yaml extension
+        if not output_filename.endswith(('.yaml', '.yml')):
+            output_filename += '.yaml'
+        output_path = os.path.join(os.getcwd(), output_filename)
+
+    with _open_buffered(output_path) as yaml_file:
+        if fast:
+            _fast_yaml_dump(samples_dict, yaml_file)
+        else:
+            yaml.dump(samples_dict, yaml_file, Dumper=SafeDumper, default_flow_style=False, indent=2)
+
+    print(f"Generated YAML file: {output_path}")
+    print(f"Converted {len(samples)} samples from {tsv_file}")
+
+    return output_path
+
+
+def list_sample_files(
+    directory: str,
+    file_extension: Union[str, List[str]],
+    threads: int = 1,
+    as_path: bool = False
+) -> List[Union[str, Path]]:
+    """
+    List all files with specified extension(s) in directory (recursive)
+
+    Returns plain path strings by default: each pathlib.Path allocates
+    several objects, and most callers only count or print the results.
+
     Args:
         directory (str): Path to directory to search
-        file_extension (str): File extension to search for
-        
+        file_extension (str or list): File extension to search for, or a
+            list of extensions matched in a single pass over the tree.
+            Extensions are normalized (leading dot) once up front; matching
+            multi-dot extensions like '.sorted.bam' works because the test
+            is a suffix match, not a last-dot-suffix lookup
+        threads (int): Number of walker threads (useful on network filesystems)
+        as_path (bool): Return pathlib.Path objects instead of strings
+
     Returns:
-        List[Path]: List of file paths
+        List[str] (or List[Path] with as_path=True): List of file paths
     """
     directory_path = Path(directory)
-    if not file_extension.startswith('.'):
-        file_extension = '.' + file_extension
-        
-    return list(directory_path.rglob(f'*{file_extension}'))
+    if isinstance(file_extension, str):
+        exts = _norm_ext(file_extension)
+    else:
+        # Deduplicated tuple, handed to str.endswith which takes the whole
+        # tuple in one C-level call per entry
+        exts = tuple(dict.fromkeys(_norm_ext(e) for e in file_extension))
 
+    files = list(_iter_files(directory_path, exts, threads=threads))
+    if as_path:
+        return [Path(p) for p in files]
+    return files
 
-def validate_samples_yaml(yaml_file: str) -> bool:
+
+def validate_samples_yaml(yaml_file: Union[str, Dict]) -> bool:
     """
     Validate that a samples YAML file has correct structure
-    
+
     Args:
-        yaml_file (str): Path to YAML file
-        
+        yaml_file (str or dict): Path to YAML file, or an already-loaded
+                                 samples dict (e.g. from generate_samples_yaml
+                                 with return_data=True), which skips the parse
+
     Returns:
         bool: True if valid, False otherwise
     """
     try:
-        with open(yaml_file, 'r') as f:
-            data = yaml.safe_load(f)
-        
+        if isinstance(yaml_file, dict):
+            data = yaml_file
+        else:
+            data = _load_yaml_cached(os.fspath(yaml_file), os.path.getmtime(yaml_file))
+
         if not isinstance(data, dict):
             return False
-            
+
         if 'samples' not in data:
             return False
             
         if not isinstance(data['samples'], dict):
             return False
             
-        # Check that all sample paths exist
-        for sample_name, sample_path in data['samples'].items():
-            if not Path(sample_path).exists():
-                print(f"Warning: Sample file not found: {sample_path}")
-                
+        # Check that all sample paths exist: one scandir per distinct parent
+        # directory instead of one stat per sample (see _missing_paths)
+        for sample_path in _missing_paths(list(data['samples'].values())):
+            print(f"Warning: Sample file not found: {sample_path}")
+
         return True
         
     except Exception as e:
@@ -137,18 +601,21 @@ def validate_samples_yaml(yaml_file: str) -> bool:
 
 
 def generate_tumor_normal_yaml(
-    patient_bams: Dict[str, Dict[str, List[str]]], 
+    patient_bams: Dict[str, Dict[str, List[str]]],
     output_filename: Optional[str] = None,
-    file_extension: str = ".sorted.bam"
+    file_extension: str = ".sorted.bam",
+    fast: bool = True
 ) -> str:
     """
     Generate tumor-normal samples YAML from patient BAM data structure
-    
+
     Args:
         patient_bams (Dict): Dictionary with patient IDs as keys and sample types (TUMOR/NORMAL) as values
         output_filename (str, optional): Custom output filename (without extension)
         file_extension (str): File extension to remove from sample names (default: ".sorted.bam")
-    
+        fast (bool): Emit the YAML with the schema-specialized writer (default);
+                     set False to go through the general PyYAML dumper
+
     Returns:
         str: Path to generated YAML file
         
@@ -161,53 +628,69 @@ def generate_tumor_normal_yaml(
         }
     """
     yaml_structure = {'SAMPLES': {}}
-    
+
+    ext_len = len(file_extension)
+    total_samples = 0
+
     for patient_id, sample_types in patient_bams.items():
         patient_data = {}
         for sample_type, bam_paths in sample_types.items():
             if bam_paths:  # Only add if there are BAM files
                 patient_data[sample_type] = {}
+                total_samples += len(bam_paths)
                 for bam_path in bam_paths:
-                    # Extract sample name from the BAM file path
+                    # Extract sample name from the BAM file path; endswith +
+                    # slice only touches the suffix, where replace() would
+                    # scan the whole name (and mangle a mid-name occurrence)
                     filename = os.path.basename(bam_path)
-                    sample_name = filename.replace(file_extension, '')
+                    if filename.endswith(file_extension):
+                        sample_name = filename[:-ext_len]
+                    else:
+                        sample_name = filename
                     patient_data[sample_type][sample_name] = bam_path
         
         # Add patient data directly under patient ID
         yaml_structure['SAMPLES'][patient_id] = patient_data
     
-    # Generate output filename with timestamp if not provided
+    # Write YAML file to current working directory, timestamped by default
     if output_filename is None:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_filename = f"tumor_normal_samples_{timestamp}"
-    
-    # Ensure .yaml extension
-    if not output_filename.endswith('.yaml') and not output_filename.endswith('.yml'):
-        output_filename += '.yaml'
-    
-    # Write YAML file to current working directory
-    output_path = Path.cwd() / output_filename
-    
-    # Custom representer to format the output nicely
-    def dict_representer(dumper, data):
-        return dumper.represent_mapping(
-            yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG,
-            data.items()
-        )
-    
-    yaml.add_representer(dict, dict_representer)
-    
-    with open(output_path, 'w') as f:
-        yaml.dump(yaml_structure, f, default_flow_style=False, sort_keys=False, indent=2)
+        output_path = _default_output_path("tumor_normal_samples", ".yaml")
+    else:
+        # Ensure .yaml extension
+        if not output_filename.endswith(('.yaml', '.yml')):
+            output_filename += '.yaml'
+        output_path = os.path.join(os.getcwd(), output_filename)
+
+    with _open_buffered(output_path) as f:
+        if fast:
+            _fast_yaml_dump(yaml_structure, f)
+        else:
+            # sort_keys=False keeps dict insertion order (guaranteed since
+            # Python 3.7) without a custom representer, which would force
+            # the dump off the C emitter fast path
+            yaml.dump(yaml_structure, f, Dumper=SafeDumper,
+                      default_flow_style=False, sort_keys=False, indent=2)
     
-    # Count samples
     total_patients = len(patient_bams)
-    total_samples = sum(len(types) for types in patient_bams.values() for types in types.values())
-    
+
     print(f"Generated tumor-normal YAML file: {output_path}")
     print(f"Processed {total_patients} patients with {total_samples} total samples")
     
-    return str(output_path)
+    return output_path
+
+
+def clear_discovery_cache() -> None:
+    """
+    Drop all memoized discovery and parse results
+
+    The directory-discovery caches invalidate on the root directory's mtime,
+    which does not change when only deep subtrees are modified; call this to
+    force fresh walks after such in-place edits (or in tests that rebuild
+    the same tree path).
+    """
+    _create_patient_bams.cache_clear()
+    _create_patient_samples.cache_clear()
+    _load_yaml_cached.cache_clear()
 
 
 def create_patient_bams_from_directory(
@@ -215,52 +698,133 @@ def create_patient_bams_from_directory(
     patient_pattern: str = "SHAH_H",
     tumor_pattern: str = "_T",
     normal_pattern: str = "_N",
-    file_extension: str = ".sorted.bam"
+    file_extension: str = ".sorted.bam",
+    threads: int = 1,
+    max_depth: Optional[int] = None
 ) -> Dict[str, Dict[str, List[str]]]:
     """
     Create patient_bams dictionary from directory containing BAM files
-    
+
+    Results are memoized on (directory, directory mtime, patterns), so
+    pipelines that re-discover the same tree several times per run skip the
+    re-walk; the cache invalidates when the root directory's entries change,
+    but not on deep-subtree-only modifications (acceptable trade-off for
+    discovery workloads). Treat the returned structure as read-only — it is
+    shared between cache hits.
+
     Args:
         directory (str): Directory containing BAM files
         patient_pattern (str): Pattern to identify patient ID in filename
         tumor_pattern (str): Pattern to identify tumor samples
         normal_pattern (str): Pattern to identify normal samples
         file_extension (str): File extension for BAM files
-        
+        threads (int): Number of walker threads (useful on network filesystems)
+        max_depth (int, optional): Bound the search depth when the layout is
+            known (e.g. 2 for <root>/<patient>/<sample>/file.bam); unrelated
+            deeper subtrees are never traversed, which is dramatically
+            faster on large trees with a shallow fixed BAM layout
+
     Returns:
         Dict: patient_bams structure suitable for generate_tumor_normal_yaml
     """
     directory_path = Path(directory)
     if not directory_path.exists():
         raise FileNotFoundError(f"Directory not found: {directory}")
-    
-    patient_bams = defaultdict(lambda: defaultdict(list))
-    
-    # Find all BAM files
-    bam_files = list(directory_path.rglob(f'*{file_extension}'))
-    
+
+    abs_dir = str(directory_path.absolute())
+    return _create_patient_bams(abs_dir, os.stat(abs_dir).st_mtime_ns,
+                                patient_pattern, tumor_pattern, normal_pattern,
+                                file_extension, threads, max_depth)
+
+
+@functools.lru_cache(maxsize=16)
+def _create_patient_bams(
+    directory: str,
+    mtime_ns: int,
+    patient_pattern: str,
+    tumor_pattern: str,
+    normal_pattern: str,
+    file_extension: str,
+    threads: int,
+    max_depth: Optional[int]
+) -> Dict[str, Dict[str, List[str]]]:
+    """Cached body of create_patient_bams_from_directory
+
+    directory is already absolute; mtime_ns only participates in the cache
+    key so a changed root directory forces a fresh walk.
+    """
+    # Plain dicts built via setdefault: a single C-level dict op per access,
+    # no Python lambda factory call on misses, and no inner defaultdicts
+    # leaking to callers that probe missing keys downstream.
+    patient_bams: Dict[str, Dict[str, List[str]]] = {}
+
+    # All matching runs on fsencoded bytes: the walker then never decodes
+    # dirent names, and only the few matching paths are decoded on insert.
+    # The patterns keep their baseline plain-substring meaning: tumor/normal
+    # use the C-level bytes `in` directly, and patient_pattern is re.escaped
+    # before being embedded in the ID regex.
+    tumor_b = os.fsencode(tumor_pattern)
+    normal_b = os.fsencode(normal_pattern)
+    is_tumor = lambda name: tumor_b in name
+    is_normal = lambda name: normal_b in name
+
+    # Single compiled regex for ID extraction: a lookahead anchors at the
+    # first position where patient_pattern occurs, and the consuming part
+    # grabs the first two underscore-separated fields from there — the find
+    # + slice + split(maxsplit) sequence collapsed into one C-level search.
+    pat_b = re.escape(os.fsencode(patient_pattern))
+    id_re = _compile(b'(?=' + pat_b + b')[^_]*_[^_]*')
+
+    # Find all BAM files; walking from an absolute root makes every yielded
+    # path absolute, so no per-file abspath() is needed below. With threads
+    # > 1 each top-level subtree (typically one per patient) is walked by
+    # its own pool worker: scandir releases the GIL around getdents, so the
+    # per-subtree walks genuinely overlap on network filesystems.
+    root_b = os.fsencode(directory)
+    ext_b = os.fsencode(file_extension)
+    if threads > 1:
+        sub_dirs = []
+        root_files = []
+        with os.scandir(root_b) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    sub_dirs.append(entry.path)
+                elif entry.name.endswith(ext_b):
+                    root_files.append(entry.path)
+
+        # A top-level dir sits at depth 1, so its subtree walk gets one
+        # level less of the budget
+        child_depth = None if max_depth is None else max_depth - 1
+        bam_lists = [root_files]
+        if sub_dirs and (max_depth is None or max_depth >= 1):
+            def scan(top):
+                return list(_iter_files_bytes(top, ext_b, child_depth))
+
+            with ThreadPoolExecutor(max_workers=min(threads, len(sub_dirs))) as executor:
+                bam_lists.extend(executor.map(scan, sub_dirs))
+        bam_files = chain.from_iterable(bam_lists)
+    else:
+        bam_files = _iter_files_bytes(root_b, ext_b, max_depth)
+
     for bam_file in bam_files:
-        filename = bam_file.name
-        
-        # Extract patient ID (assuming it starts after patient_pattern)
-        if patient_pattern in filename:
-            patient_start = filename.find(patient_pattern)
-            patient_id_part = filename[patient_start:]
-            
-            # Extract patient ID (until first underscore after pattern)
-            patient_id = patient_id_part.split('_')[0] + '_' + patient_id_part.split('_')[1]
-            
+        filename = os.path.basename(bam_file)
+
+        # One regex search yields the patient ID directly (see id_re above)
+        match = id_re.search(filename)
+        if match is not None:
             # Determine sample type
-            if tumor_pattern in filename:
+            if is_tumor(filename):
                 sample_type = 'TUMOR'
-            elif normal_pattern in filename:
+            elif is_normal(filename):
                 sample_type = 'NORMAL'
             else:
                 continue  # Skip files that don't match tumor/normal pattern
-            
-            patient_bams[patient_id][sample_type].append(str(bam_file.absolute()))
-    
-    return dict(patient_bams)
+
+            patient_id = os.fsdecode(match.group(0))
+            patient_bams.setdefault(patient_id, {}) \
+                        .setdefault(sample_type, []).append(os.fsdecode(bam_file))
+
+    return patient_bams
 
 
 def validate_tumor_normal_yaml(yaml_file: str) -> bool:
@@ -275,34 +839,38 @@ def validate_tumor_normal_yaml(yaml_file: str) -> bool:
     """
     try:
         with open(yaml_file, 'r') as f:
-            data = yaml.safe_load(f)
-        
+            data = _load_yaml_or_json(f)
+
         if not isinstance(data, dict):
             return False
-            
+
         if 'SAMPLES' not in data:
             return False
             
         if not isinstance(data['SAMPLES'], dict):
             return False
         
-        # Validate structure for each patient
+        # Validate structure for each patient, collecting every sample path so
+        # existence is checked in one dir-grouped batch afterwards
+        all_paths = []
         for patient_id, patient_data in data['SAMPLES'].items():
             if not isinstance(patient_data, dict):
                 return False
-            
+
             for sample_type, samples in patient_data.items():
                 if sample_type not in ['TUMOR', 'NORMAL']:
                     print(f"Warning: Unexpected sample type '{sample_type}' for patient {patient_id}")
-                
+
                 if not isinstance(samples, dict):
                     return False
-                
-                # Check that sample files exist
-                for sample_name, sample_path in samples.items():
-                    if not Path(sample_path).exists():
-                        print(f"Warning: Sample file not found: {sample_path}")
-        
+
+                all_paths.extend(samples.values())
+
+        # One scandir per distinct parent directory instead of one stat per
+        # sample (see _missing_paths)
+        for sample_path in _missing_paths(all_paths):
+            print(f"Warning: Sample file not found: {sample_path}")
+
         return True
         
     except Exception as e:
@@ -344,8 +912,7 @@ def generate_samples_tsv(
         raise ValueError(f"Path is not a directory: {directory}")
     
     # Ensure file extension starts with dot
-    if not file_extension.startswith('.'):
-        file_extension = '.' + file_extension
+    file_extension = _norm_ext(file_extension)
     
     # Set default condition patterns if not provided
     if condition_patterns is None:
@@ -354,83 +921,104 @@ def generate_samples_tsv(
             'Normal': ['normal']
         }
     
-    header = ["patient", "sample", "condition", "path"]
-    rows = []
-    
-    # Find all files with specified extension
-    for file_path in directory_path.rglob(f'*{file_extension}'):
-        if file_path.is_file():
-            full_path = str(file_path.absolute())
-            path_parts = full_path.split(os.sep)
-            
-            patient = "Unknown"
-            sample = "Unknown"
-            condition_val = "Unknown"
-            
-            # Try to find condition in path
-            condition_index = -1
-            for i, part in enumerate(path_parts):
-                part_lower = part.lower()
-                for condition, patterns in condition_patterns.items():
-                    if any(pattern.lower() in part_lower for pattern in patterns):
-                        condition_val = condition
-                        condition_index = i
-                        break
-                if condition_index != -1:
-                    break
-            
-            if condition_index != -1:  # Condition was found
-                # Patient extraction - look for directory before condition
-                if condition_index - 1 >= 0:
-                    patient = path_parts[condition_index - 1]
-                
-                # Sample extraction - look for directory after condition
-                if condition_index + 1 < len(path_parts) - 1:  # -1 to exclude filename
-                    sample = path_parts[condition_index + 1]
-            
-            else:  # Condition not found, use fallback logic
-                # Get path relative to search directory
-                relative_path = os.path.relpath(full_path, os.path.normpath(str(directory)))
-                relative_path_parts = relative_path.split(os.sep)
-                
-                if len(relative_path_parts) >= 2:  # At least patient_dir/file.ext
-                    patient = relative_path_parts[0]
-                    
-                    if len(relative_path_parts) >= 3:  # patient_dir/.../sample_dir/file.ext
-                        # Sample is the directory containing the file
-                        sample = relative_path_parts[-2]
-            
-            rows.append({
-                "patient": patient,
-                "sample": sample,
-                "condition": condition_val,
-                "path": full_path
-            })
-    
-    if not rows:
-        raise ValueError(f"No files with extension '{file_extension}' found in {directory}")
-    
-    # Generate output filename with timestamp if not provided
+    header = ("patient", "sample", "condition", "path")
+
+    # One combined case-insensitive regex over all patterns
+    classify = _condition_matcher(condition_patterns)
+
+    # Write TSV file to current working directory, timestamped by default
     if output_filename is None:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_filename = f"samples_{timestamp}"
-    
-    # Ensure .tsv extension
-    if not output_filename.endswith('.tsv'):
-        output_filename += '.tsv'
-    
-    # Write TSV file to current working directory
-    output_path = Path.cwd() / output_filename
-    
-    with open(output_path, 'w', newline='') as tsvfile:
-        writer = csv.DictWriter(tsvfile, fieldnames=header, delimiter='\t')
-        writer.writeheader()
-        writer.writerows(rows)
-    
+        output_path = _default_output_path("samples", ".tsv")
+    else:
+        # Ensure .tsv extension
+        if not output_filename.endswith('.tsv'):
+            output_filename += '.tsv'
+        output_path = os.path.join(os.getcwd(), output_filename)
+
+    # Files in the same directory share every component but the filename, so
+    # the walk carries each directory's classification (condition, patient,
+    # sample, fallback anchors) down the recursion: each component is
+    # classified exactly once per directory rather than once per file.
+    abs_root = str(directory_path.absolute())
+    root_parts = abs_root.split(os.sep)
+
+    condition_val = None
+    cond_patient = "Unknown"
+    cond_sample = None
+    for i, part in enumerate(root_parts):
+        condition = classify(part)
+        if condition:
+            condition_val = condition
+            if i - 1 >= 0:
+                cond_patient = root_parts[i - 1]
+            if i + 1 < len(root_parts):
+                cond_sample = root_parts[i + 1]
+            break
+
+    # Rows are streamed to the open file as tuples: no intermediate list of
+    # per-row dicts, and plain csv.writer skips DictWriter's fieldname
+    # lookup on every row. A counter stands in for len(rows).
+    n_rows = 0
+
+    # Stack entries: (dir path, dir basename, depth below root, first
+    # component below root, condition, patient, sample-dir-or-None)
+    stack = [(abs_root, root_parts[-1], 0, None,
+              condition_val, cond_patient, cond_sample)]
+    with _open_buffered(output_path, newline='') as tsvfile:
+        writer = csv.writer(tsvfile, delimiter='\t')
+        writer.writerow(header)
+        while stack:
+            dir_path, dir_name, depth, first_rel, cond, patient, sample = stack.pop()
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    name = entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        child_first = name if depth == 0 else first_rel
+                        if cond is None:
+                            child_cond = classify(name)
+                            if child_cond:
+                                # This dir is the condition marker: its parent is
+                                # the patient, the next level down the sample
+                                stack.append((entry.path, name, depth + 1,
+                                              child_first, child_cond, dir_name, None))
+                            else:
+                                stack.append((entry.path, name, depth + 1,
+                                              child_first, None, patient, sample))
+                        elif sample is None:
+                            stack.append((entry.path, name, depth + 1,
+                                          child_first, cond, patient, name))
+                        else:
+                            stack.append((entry.path, name, depth + 1,
+                                          child_first, cond, patient, sample))
+                    elif name.endswith(file_extension):
+                        full_path = entry.path
+                        file_cond = cond or classify(name)
+                        if file_cond is not None:
+                            if cond is None:
+                                # Matched on the filename itself: the containing
+                                # dir is the patient, no sample dir
+                                row_patient, row_sample = dir_name, "Unknown"
+                            else:
+                                row_patient = patient
+                                row_sample = sample if sample is not None else "Unknown"
+                            writer.writerow((row_patient, row_sample, file_cond, full_path))
+                        else:
+                            # Fallback by depth below the search directory:
+                            # patient_dir[/.../sample_dir]/file.ext
+                            writer.writerow((first_rel if depth >= 1 else "Unknown",
+                                             dir_name if depth >= 2 else "Unknown",
+                                             "Unknown", full_path))
+                        n_rows += 1
+
+    if n_rows == 0:
+        # Don't leave a header-only sheet behind on the no-matches error path
+        os.remove(output_path)
+        raise ValueError(f"No files with extension '{file_extension}' found in {directory}")
+
     print(f"Generated TSV file: {output_path}")
-    print(f"Found {len(rows)} samples with extension '{file_extension}'")
-    
-    return str(output_path)
+    print(f"Found {n_rows} samples with extension '{file_extension}'")
+
+    return output_path
 
 
 def create_patient_samples_from_directory(
@@ -448,65 +1036,90 @@ def create_patient_samples_from_directory(
         patient_pattern (str, optional): Pattern to identify patient ID in path
         condition_patterns (Dict[str, List[str]], optional): Dictionary mapping condition names to patterns
         
+    Results are memoized the same way as create_patient_bams_from_directory
+    (keyed on the directory's absolute path, its mtime, the patterns and the
+    extension); treat the returned structure as read-only.
+
     Returns:
         Dict: Nested dictionary structure {patient: {condition: {sample: path}}}
     """
     directory_path = Path(directory)
     if not directory_path.exists():
         raise FileNotFoundError(f"Directory not found: {directory}")
-    
+
     # Ensure file extension starts with dot
-    if not file_extension.startswith('.'):
-        file_extension = '.' + file_extension
-    
+    file_extension = _norm_ext(file_extension)
+
     # Set default condition patterns if not provided
     if condition_patterns is None:
         condition_patterns = {
             'TUMOR': ['tumor'],
             'NORMAL': ['normal']
         }
-    
-    patient_samples = defaultdict(lambda: defaultdict(dict))
-    
-    # Find all files with specified extension
-    for file_path in directory_path.rglob(f'*{file_extension}'):
-        if file_path.is_file():
-            full_path = str(file_path.absolute())
-            path_parts = full_path.split(os.sep)
-            
-            patient = None
-            condition = None
-            sample = file_path.stem  # Default sample name is filename without extension
-            
-            # Try to find condition in path
-            for i, part in enumerate(path_parts):
-                part_lower = part.lower()
-                for cond_name, patterns in condition_patterns.items():
-                    if any(pattern.lower() in part_lower for pattern in patterns):
-                        condition = cond_name
-                        
-                        # Extract patient ID (directory before condition)
-                        if i - 1 >= 0:
-                            patient = path_parts[i - 1]
-                        
-                        # Extract sample name (directory after condition, if exists)
-                        if i + 1 < len(path_parts) - 1:
-                            sample = path_parts[i + 1]
-                        
-                        break
-                
-                if condition:
+
+    # The cache key needs hashable arguments, so the patterns dict is frozen
+    # into a tuple of (condition, patterns) pairs
+    abs_dir = str(directory_path.absolute())
+    patterns_key = tuple((cond, tuple(pats)) for cond, pats in condition_patterns.items())
+    return _create_patient_samples(abs_dir, os.stat(abs_dir).st_mtime_ns,
+                                   file_extension, patient_pattern, patterns_key)
+
+
+@functools.lru_cache(maxsize=16)
+def _create_patient_samples(
+    directory: str,
+    mtime_ns: int,
+    file_extension: str,
+    patient_pattern: Optional[str],
+    patterns_key: tuple
+) -> Dict[str, Dict[str, Dict[str, str]]]:
+    """Cached body of create_patient_samples_from_directory
+
+    directory is already absolute; mtime_ns only participates in the cache
+    key so a changed root directory forces a fresh walk.
+    """
+    condition_patterns = {cond: list(pats) for cond, pats in patterns_key}
+
+    # Plain dicts built via setdefault (see create_patient_bams_from_directory)
+    patient_samples: Dict[str, Dict[str, Dict[str, str]]] = {}
+
+    # One combined case-insensitive regex over all patterns
+    match_condition = _condition_matcher(condition_patterns)
+
+    # Find all files with specified extension; the scandir walker classifies
+    # entries from d_type and yields absolute path strings directly
+    for full_path in _iter_files(directory, file_extension):
+        path_parts = full_path.split(os.sep)
+
+        patient = None
+        condition = None
+        # Default sample name is filename without extension
+        sample = os.path.splitext(os.path.basename(full_path))[0]
+
+        # Try to find condition in path
+        for i, part in enumerate(path_parts):
+            condition = match_condition(part)
+            if condition:
+                # Extract patient ID (directory before condition)
+                if i - 1 >= 0:
+                    patient = path_parts[i - 1]
+
+                # Extract sample name (directory after condition, if exists)
+                if i + 1 < len(path_parts) - 1:
+                    sample = path_parts[i + 1]
+
+                break
+
+        # If patient pattern provided and patient not found, try pattern matching
+        if patient_pattern and not patient:
+            for part in path_parts:
+                if patient_pattern in part:
+                    patient = part
                     break
-            
-            # If patient pattern provided and patient not found, try pattern matching
-            if patient_pattern and not patient:
-                for part in path_parts:
-                    if patient_pattern in part:
-                        patient = part
-                        break
-            
-            # Only add if we found both patient and condition
-            if patient and condition:
-                patient_samples[patient][condition][sample] = full_path
-    
-    return dict(patient_samples)
\ No newline at end of file
+
+        # Only add if we found both patient and condition
+        if patient and condition:
+            patient_samples.setdefault(patient, {}) \
+                           .setdefault(condition, {})[sample] = full_path
+
+    return patient_samples
\ No newline at end of file
@@ -0,0 +1,163 @@
+"""
+Tests for the create_samples_tsv sample sheet script
+"""
+
+import csv
+import os
+import sys
+import tempfile
+from collections import deque
+from operator import itemgetter
+
+# The script lives at the repository root, next to the src/ tree
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from create_samples_tsv import tum_norm_tsv
+
+
+def _create_dir_structure(base, structure):
+    """Materialize a nested directory description under base
+
+    Dict values are subdirectories, list values are the files a directory
+    contains. The description is flattened first and directories are created
+    shortest-path-first with plain os.mkdir — every parent is guaranteed to
+    exist already, so none of the per-component existence checks os.makedirs
+    performs at every level are needed.
+    """
+    dirs = set()
+    files = []
+
+    # Explicit work-stack instead of recursion: no frame setup per level
+    # and arbitrarily deep descriptions cannot hit the recursion limit
+    stack = deque([(base, structure)])
+    while stack:
+        prefix, node = stack.pop()
+        for name, value in node.items():
+            path = os.path.join(prefix, name)
+            dirs.add(path)
+            if isinstance(value, dict):
+                stack.append((path, value))
+            else:
+                files.extend(os.path.join(path, file_name) for file_name in value)
+
+    for path in sorted(dirs, key=len):
+        try:
+            os.mkdir(path)
+        except FileExistsError:
+            pass
+
+    for file_path in files:
+        # The tests only look at names and paths, so zero-byte files
+        # suffice: open+close skips the write() syscall
+        os.close(os.open(file_path, os.O_CREAT | os.O_WRONLY | os.O_TRUNC, 0o644))
+
+
+def _fast_rmtree(path):
+    """Remove a tree with a scandir stack instead of shutil.rmtree
+
+    DirEntry.is_dir reuses the d_type from the directory read, so each entry
+    costs one unlink rather than shutil's extra lstat; directories are
+    removed children-first from the recorded visit order.
+    """
+    stack = [path]
+    dirs = []
+    while stack:
+        current = stack.pop()
+        dirs.append(current)
+        with os.scandir(current) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                else:
+                    os.unlink(entry.path)
+    # Every child directory was appended after its parent, so the reversed
+    # order is a valid post-order removal
+    for directory in reversed(dirs):
+        os.rmdir(directory)
+
+
+class TestTumNormTsv:
+
+    # One patient with both conditions, one tumor-only patient, and a
+    # subtree with no condition directory to exercise the depth fallback
+    TREE = {
+        'SHAH_H01': {
+            'tumor': {'s1': ['a.bed']},
+            'normal': {'s2': ['b.bed']},
+        },
+        'SHAH_H02': {
+            'tumor': {'s3': ['c.bed', 'notes.txt']},
+        },
+        'misc': {
+            'inner': ['d.bed'],
+        },
+    }
+
+    @classmethod
+    def setup_class(cls):
+        # The tree is invariant across tests, so it is built once for the
+        # whole class instead of once per test method, and the expected rows
+        # are precomputed here with paths already normalized — no per-test
+        # normpath sweeps over full row lists
+        cls.test_dir = tempfile.mkdtemp()
+        _create_dir_structure(cls.test_dir, cls.TREE)
+        join = os.path.join
+        cls.expected_rows = sorted([
+            ('SHAH_H01', 's1', 'Tumor',
+             os.path.normpath(join(cls.test_dir, 'SHAH_H01', 'tumor', 's1', 'a.bed'))),
+            ('SHAH_H01', 's2', 'Normal',
+             os.path.normpath(join(cls.test_dir, 'SHAH_H01', 'normal', 's2', 'b.bed'))),
+            ('SHAH_H02', 's3', 'Tumor',
+             os.path.normpath(join(cls.test_dir, 'SHAH_H02', 'tumor', 's3', 'c.bed'))),
+            ('misc', 'inner', 'Unknown',
+             os.path.normpath(join(cls.test_dir, 'misc', 'inner', 'd.bed'))),
+        ], key=itemgetter(3))
+
+    @classmethod
+    def teardown_class(cls):
+        _fast_rmtree(cls.test_dir)
+
+    def _run(self, name, **kwargs):
+        """Run tum_norm_tsv into a per-test output file and return its rows"""
+        output = os.path.join(self.test_dir, name)
+        tum_norm_tsv(self.test_dir, '.bed', output, **kwargs)
+        with open(output, newline='') as f:
+            # itemgetter is a C-level key callable, unlike a per-row lambda
+            return sorted(csv.DictReader(f, delimiter='\t'),
+                          key=itemgetter('path'))
+
+    def test_row_count_and_header(self):
+        rows = self._run('out_basic.tsv')
+        assert len(rows) == 4
+        assert list(rows[0].keys()) == ['patient', 'sample', 'condition', 'path']
+
+    def test_full_output_matches_expected(self):
+        rows = self._run('out_full.tsv')
+        # One normalization pass over the actual rows; the expected side was
+        # normalized once at class setup
+        _np = os.path.normpath
+        actual = [(r['patient'], r['sample'], r['condition'], _np(r['path']))
+                  for r in rows]
+        assert actual == self.expected_rows
+
+    def test_tumor_normal_classification(self):
+        rows = self._run('out_conditions.tsv')
+        by_file = {os.path.basename(row['path']): row for row in rows}
+        assert by_file['a.bed']['condition'] == 'Tumor'
+        assert by_file['a.bed']['patient'] == 'SHAH_H01'
+        assert by_file['a.bed']['sample'] == 's1'
+        assert by_file['b.bed']['condition'] == 'Normal'
+        assert by_file['b.bed']['sample'] == 's2'
+        assert by_file['c.bed']['patient'] == 'SHAH_H02'
+
+    def test_fallback_without_condition_dir(self):
+        rows = self._run('out_fallback.tsv')
+        by_file = {os.path.basename(row['path']): row for row in rows}
+        assert by_file['d.bed']['condition'] == 'Unknown'
+        assert by_file['d.bed']['patient'] == 'misc'
+        assert by_file['d.bed']['sample'] == 'inner'
+
+    def test_skip_dirs_prunes_subtree(self):
+        rows = self._run('out_skip.tsv', skip_dirs=frozenset({'misc'}))
+        assert all(os.path.basename(row['path']) != 'd.bed' for row in rows)
+        assert len(rows) == 3
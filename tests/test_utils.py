@@ -8,8 +8,9 @@ import os
 from pathlib import Path
 import yaml
 from pureMeth.utils import (
-    generate_samples_yaml, 
-    list_sample_files, 
+    generate_samples_yaml,
+    generate_samples_yaml_from_tsv,
+    list_sample_files,
     validate_samples_yaml,
     generate_tumor_normal_yaml,
     create_patient_bams_from_directory,
@@ -59,6 +60,24 @@ class TestGenerateSamplesYaml:
             with pytest.raises(ValueError):
                 generate_samples_yaml(temp_dir, '.fast5')
     
+    def test_numeric_stem_samples_round_trip_as_strings(self):
+        """Test that numeric/bool-like sample names survive the fast writer"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            # Stems that YAML would resolve to non-strings if left unquoted
+            for file_name in ['0001.fast5', 'true.fast5']:
+                (Path(temp_dir) / file_name).touch()
+
+            output_file = generate_samples_yaml(temp_dir, '.fast5', 'test_samples')
+
+            with open(output_file, 'r') as f:
+                data = yaml.safe_load(f)
+
+            # Unquoted, '0001' would load as 1 and 'true' as True
+            assert sorted(data['samples']) == ['0001', 'true']
+
+            # Clean up
+            os.unlink(output_file)
+
     def test_file_extension_normalization(self):
         """Test that file extensions are normalized (adding dot if missing)"""
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -79,6 +98,47 @@ class TestGenerateSamplesYaml:
             os.unlink(output_file)
 
 
+class TestGenerateSamplesYamlFromTsv:
+
+    def test_generate_samples_yaml_from_tsv_basic(self):
+        """Test converting a two-column TSV into a samples YAML"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            tsv_file = Path(temp_dir) / 'samples.tsv'
+            tsv_file.write_text(
+                'sample1\t/path/to/sample1.fast5\n'
+                'sample2\t/path/to/sample2.fast5\n'
+            )
+
+            output_file = generate_samples_yaml_from_tsv(str(tsv_file), 'test_from_tsv')
+
+            assert Path(output_file).exists()
+
+            with open(output_file, 'r') as f:
+                data = yaml.safe_load(f)
+
+            assert data == {
+                'samples': {
+                    'sample1': '/path/to/sample1.fast5',
+                    'sample2': '/path/to/sample2.fast5'
+                }
+            }
+
+            # Clean up
+            os.unlink(output_file)
+
+    def test_generate_samples_yaml_from_tsv_malformed_row(self):
+        """Test error handling for a row with fewer than two columns"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            tsv_file = Path(temp_dir) / 'samples.tsv'
+            tsv_file.write_text(
+                'sample1\t/path/to/sample1.fast5\n'
+                'sample2\n'
+            )
+
+            with pytest.raises(ValueError, match='line 2'):
+                generate_samples_yaml_from_tsv(str(tsv_file))
+
+
 class TestListSampleFiles:
     
     def test_list_sample_files(self):
@@ -90,35 +150,42 @@ class TestListSampleFiles:
                 (Path(temp_dir) / file_name).touch()
             
             files = list_sample_files(temp_dir, '.fast5')
-            
+
             assert len(files) == 2
+            assert all(f.endswith('.fast5') for f in files)
+
+    def test_list_sample_files_as_path(self):
+        """Test that as_path=True returns Path objects"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            (Path(temp_dir) / 'sample1.fast5').touch()
+
+            files = list_sample_files(temp_dir, '.fast5', as_path=True)
+
+            assert len(files) == 1
             assert all(f.suffix == '.fast5' for f in files)
 
 
 class TestValidateSamplesYaml:
     
     def test_validate_samples_yaml_valid(self):
-        """Test validation of valid YAML file"""
+        """Test validation of a valid samples dict (no file round-trip)"""
         with tempfile.TemporaryDirectory() as temp_dir:
             # Create sample files
             sample1 = Path(temp_dir) / 'sample1.fast5'
             sample2 = Path(temp_dir) / 'sample2.fast5'
             sample1.touch()
             sample2.touch()
-            
-            # Create valid YAML
+
+            # Validate the in-memory structure directly; the dump/parse
+            # round-trip is covered by the invalid-structure test below
             yaml_content = {
                 'samples': {
                     'sample1': str(sample1),
                     'sample2': str(sample2)
                 }
             }
-            
-            yaml_file = Path(temp_dir) / 'test.yaml'
-            with open(yaml_file, 'w') as f:
-                yaml.dump(yaml_content, f)
-            
-            assert validate_samples_yaml(str(yaml_file)) is True
+
+            assert validate_samples_yaml(yaml_content) is True
     
     def test_validate_samples_yaml_invalid_structure(self):
         """Test validation of invalid YAML structure"""